@@ -0,0 +1,82 @@
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Budgets for a bare `manage.py help` startup. Regressions here usually
+# mean a heavy import (numpy, torch, drf_yasg, ...) crept into settings
+# or a module imported at startup.
+DEFAULT_MAX_MODULES = 1500
+DEFAULT_MAX_IMPORT_MS = 800
+
+_IMPORTTIME_LINE = re.compile(
+    r'^import time:\s+(?P<self_us>\d+)\s+\|\s+(?P<cum_us>\d+)\s+\|(?P<name>.+)$'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run `manage.py help` under -X importtime and fail if the module "
+        "count or total import time exceeds the startup budget"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-modules', type=int, default=DEFAULT_MAX_MODULES,
+            help=f"Maximum modules imported at startup (default {DEFAULT_MAX_MODULES})",
+        )
+        parser.add_argument(
+            '--max-import-ms', type=int, default=DEFAULT_MAX_IMPORT_MS,
+            help=f"Maximum cumulative import time in ms (default {DEFAULT_MAX_IMPORT_MS})",
+        )
+        parser.add_argument(
+            '--top', type=int, default=10,
+            help="How many of the slowest imports to print (default 10)",
+        )
+
+    def handle(self, *args, **options):
+        # Resolve manage.py from the project root so the command works
+        # regardless of the caller's current directory
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime',
+             str(settings.BASE_DIR / 'manage.py'), 'help'],
+            capture_output=True, text=True, cwd=settings.BASE_DIR,
+        )
+        if result.returncode != 0:
+            raise CommandError(
+                'manage.py help failed under -X importtime:\n%s' % result.stderr
+            )
+
+        modules = []
+        for line in result.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if match:
+                modules.append((
+                    match['name'].strip(),
+                    int(match['self_us']),
+                ))
+
+        module_count = len(modules)
+        total_ms = sum(self_us for _, self_us in modules) / 1000
+
+        self.stdout.write(
+            f"Startup imports: {module_count} modules, {total_ms:.0f} ms total"
+        )
+        for name, self_us in sorted(modules, key=lambda m: -m[1])[:options['top']]:
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms  {name}")
+
+        failures = []
+        if module_count > options['max_modules']:
+            failures.append(
+                f"module count {module_count} exceeds budget {options['max_modules']}"
+            )
+        if total_ms > options['max_import_ms']:
+            failures.append(
+                f"import time {total_ms:.0f} ms exceeds budget {options['max_import_ms']} ms"
+            )
+        if failures:
+            raise CommandError('; '.join(failures))
+
+        self.stdout.write(self.style.SUCCESS("Startup import budget OK"))
@@ -58,28 +58,33 @@ class User(AbstractUser):
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
     
+    # Role groupings for the permission helpers, precomputed once so the
+    # checks (called several times per request across permissions,
+    # querysets and serializers) are single set lookups
+    APPROVER_ROLES = frozenset({
+        Role.APPROVER_LEVEL_1,
+        Role.APPROVER_LEVEL_2,
+        Role.ADMIN,
+    })
+    FINANCE_ROLES = frozenset({Role.FINANCE, Role.ADMIN})
+    APPROVAL_LEVELS = {
+        Role.APPROVER_LEVEL_1: 1,
+        Role.APPROVER_LEVEL_2: 2,
+        Role.ADMIN: 999,  # Admin can approve at any level
+    }
+
     def can_approve_requests(self):
         """Check if user can approve purchase requests"""
-        return self.role in [
-            self.Role.APPROVER_LEVEL_1,
-            self.Role.APPROVER_LEVEL_2,
-            self.Role.ADMIN
-        ]
-    
+        return self.role in self.APPROVER_ROLES
+
     def can_access_finance(self):
         """Check if user can access finance features"""
-        return self.role in [self.Role.FINANCE, self.Role.ADMIN]
-    
+        return self.role in self.FINANCE_ROLES
+
     def is_staff_user(self):
         """Check if user is staff level"""
         return self.role == self.Role.STAFF
-    
+
     def get_approval_level(self):
         """Get the approval level for this user"""
-        if self.role == self.Role.APPROVER_LEVEL_1:
-            return 1
-        elif self.role == self.Role.APPROVER_LEVEL_2:
-            return 2
-        elif self.role == self.Role.ADMIN:
-            return 999  # Admin can approve at any level
-        return 0
\ No newline at end of file
+        return self.APPROVAL_LEVELS.get(self.role, 0)
\ No newline at end of file
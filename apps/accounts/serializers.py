@@ -13,11 +13,11 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = User
-        fields = [
+        fields = (
             'username', 'email', 'first_name', 'last_name',
             'password', 'password_confirm', 'role', 'department',
             'employee_id', 'phone_number'
-        ]
+        )
         extra_kwargs = {
             'email': {'required': True},
             'first_name': {'required': True},
@@ -72,13 +72,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = User
-        fields = [
+        fields = (
             'id', 'username', 'email', 'first_name', 'last_name',
             'full_name', 'role', 'department', 'employee_id',
             'phone_number', 'can_approve_requests', 'can_access_finance',
             'approval_level', 'is_active', 'date_joined'
-        ]
-        read_only_fields = ['id', 'username', 'date_joined']
+        )
+        read_only_fields = ('id', 'username', 'date_joined')
     
     def get_approval_level(self, obj):
         return obj.get_approval_level()
@@ -92,10 +92,10 @@ class UserListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = User
-        fields = [
+        fields = (
             'id', 'username', 'full_name', 'email', 'role',
             'department', 'employee_id', 'is_active'
-        ]
+        )
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -24,7 +24,7 @@ def process_proforma_document(self, job_id: str):
         job = AIProcessingJob.objects.get(id=job_id)
         job.status = AIProcessingJob.Status.PROCESSING
         job.started_at = timezone.now()
-        job.save()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
         
         logger.info(f"Starting proforma processing for job {job_id}")
         
@@ -71,17 +71,22 @@ def process_proforma_document(self, job_id: str):
             'extracted_text': extracted_text[:1000],  # First 1000 chars for reference
             'document_data_id': str(document_data.id)
         }
-        job.save()
+        job.save(update_fields=[
+            'status', 'completed_at', 'processing_time', 'output_data', 'updated_at'
+        ])
         
         # Update purchase request
         if job.purchase_request:
+            changed = ['proforma_processed', 'updated_at']
             job.purchase_request.proforma_processed = True
             # Update vendor info from extracted data
             if extracted_data.get('vendor_name'):
                 job.purchase_request.vendor_name = extracted_data['vendor_name']
+                changed.append('vendor_name')
             if extracted_data.get('vendor_email'):
                 job.purchase_request.vendor_email = extracted_data['vendor_email']
-            job.purchase_request.save()
+                changed.append('vendor_email')
+            job.purchase_request.save(update_fields=changed)
         
         logger.info(f"Proforma processing completed for job {job_id}")
         return {
@@ -98,7 +103,7 @@ def process_proforma_document(self, job_id: str):
         job.status = AIProcessingJob.Status.FAILED
         job.error_message = str(e)
         job.retry_count += 1
-        job.save()
+        job.save(update_fields=['status', 'error_message', 'retry_count', 'updated_at'])
         
         # Retry if under max retries
         if job.retry_count < job.max_retries:
@@ -194,11 +199,13 @@ def generate_purchase_order(self, purchase_request_id: str):
         job.completed_at = timezone.now()
         job.processing_time = (job.completed_at - job.started_at).total_seconds()
         job.output_data = po_data
-        job.save()
+        job.save(update_fields=[
+            'status', 'completed_at', 'processing_time', 'output_data', 'updated_at'
+        ])
         
         # Update purchase request
         purchase_request.po_generated = True
-        purchase_request.save()
+        purchase_request.save(update_fields=['po_generated', 'updated_at'])
         
         logger.info(f"PO generation completed for request {purchase_request_id}")
         return {
@@ -216,7 +223,7 @@ def generate_purchase_order(self, purchase_request_id: str):
             job.status = AIProcessingJob.Status.FAILED
             job.error_message = str(e)
             job.retry_count += 1
-            job.save()
+            job.save(update_fields=['status', 'error_message', 'retry_count', 'updated_at'])
             
             # Retry if under max retries
             if job.retry_count < job.max_retries:
@@ -309,11 +316,13 @@ def validate_receipt_document(self, purchase_request_id: str):
             'validation_result': validation_result,
             'validation_record_id': str(validation_record.id)
         }
-        job.save()
+        job.save(update_fields=[
+            'status', 'completed_at', 'processing_time', 'output_data', 'updated_at'
+        ])
         
         # Update purchase request
         purchase_request.receipt_validated = True
-        purchase_request.save()
+        purchase_request.save(update_fields=['receipt_validated', 'updated_at'])
         
         logger.info(f"Receipt validation completed for request {purchase_request_id}")
         return {
@@ -330,7 +339,7 @@ def validate_receipt_document(self, purchase_request_id: str):
             job.status = AIProcessingJob.Status.FAILED
             job.error_message = str(e)
             job.retry_count += 1
-            job.save()
+            job.save(update_fields=['status', 'error_message', 'retry_count', 'updated_at'])
             
             # Retry if under max retries
             if job.retry_count < job.retry_count:
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Enable pg_trgm and index the searched columns (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS purchase_requests_title_trgm '
+        'ON purchase_requests USING gin (title gin_trgm_ops)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS purchase_requests_description_trgm '
+        'ON purchase_requests USING gin (description gin_trgm_ops)'
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS purchase_requests_description_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS purchase_requests_title_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-08-31 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0002_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='approval',
+            index=models.Index(fields=['approver', 'approved'], name='approvals_approve_fd35e0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaserequest',
+            index=models.Index(fields=['status', '-created_at'], name='purchase_re_status_f43ba2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaserequest',
+            index=models.Index(fields=['created_by', '-created_at'], name='purchase_re_created_2b6b2b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaserequest',
+            index=models.Index(fields=['status', '-updated_at'], name='purchase_re_status_f768cd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaserequest',
+            index=models.Index(fields=['status', 'priority', 'amount'], name='purchase_re_status_ea3e2a_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-08-31 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchases', '0003_approval_approvals_approve_fd35e0_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaserequest',
+            index=models.Index(fields=['amount'], name='purchase_re_amount_0e1b30_idx'),
+        ),
+    ]
@@ -7,11 +7,67 @@ import uuid
 User = get_user_model()
 
 
+class PurchaseRequestQuerySet(models.QuerySet):
+    """
+    Role-based access rules expressed in SQL, so views can filter rows
+    the user may not see instead of fetching them and rejecting in Python
+    """
+
+    def for_user(self, user):
+        """Rows the user may access (mirrors CanAccessPurchaseRequest)"""
+        # Approvers and admins see everything
+        if user.can_approve_requests():
+            return self
+        # Finance sees approved requests plus their own
+        if user.can_access_finance():
+            return self.filter(
+                models.Q(created_by=user) |
+                models.Q(status=PurchaseRequest.Status.APPROVED)
+            )
+        # Everyone else: own requests only
+        return self.filter(created_by=user)
+
+    def pending_for_approver(self, user):
+        """Pending requests where `user` is one of the next approvers.
+
+        Encodes the workflow rules (level 1 first, level 2 only above
+        1000) as Exists annotations so one query replaces the per-row
+        get_pending_approvers() cascade.
+        """
+        level = user.get_approval_level()
+        if not level:
+            return self.none()
+
+        level_one_approved = Approval.objects.filter(
+            purchase_request=models.OuterRef('pk'), approval_level=1, approved=True
+        )
+        level_two_approved = Approval.objects.filter(
+            purchase_request=models.OuterRef('pk'), approval_level=2, approved=True
+        )
+
+        queryset = self.filter(
+            status=PurchaseRequest.Status.PENDING
+        ).annotate(
+            level_one_done=models.Exists(level_one_approved),
+            level_two_done=models.Exists(level_two_approved),
+        )
+
+        if level == 1:
+            # Level 1 approvers only act while level 1 is still open
+            return queryset.filter(level_one_done=False)
+
+        # Level 2 approvers and admins act on whichever level is next
+        return queryset.filter(
+            models.Q(level_one_done=False) |
+            models.Q(amount__gt=1000, level_two_done=False)
+        )
+
+
 class PurchaseRequest(models.Model):
     """
     Main purchase request model with approval workflow
     """
-    
+
     class Status(models.TextChoices):
         PENDING = 'pending', 'Pending'
         APPROVED = 'approved', 'Approved'
@@ -114,12 +170,25 @@ class PurchaseRequest(models.Model):
     proforma_processed = models.BooleanField(default=False)
     po_generated = models.BooleanField(default=False)
     receipt_validated = models.BooleanField(default=False)
-    
+
+    objects = PurchaseRequestQuerySet.as_manager()
+
     class Meta:
         db_table = 'purchase_requests'
         ordering = ['-created_at']
         verbose_name = 'Purchase Request'
         verbose_name_plural = 'Purchase Requests'
+        indexes = [
+            # Role-filtered lists ordered by recency
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['created_by', '-created_at']),
+            # Finance view: approved requests by last update
+            models.Index(fields=['status', '-updated_at']),
+            # Status/priority/amount filter combinations on the list view
+            models.Index(fields=['status', 'priority', 'amount']),
+            # Amount-range filters without a status prefix
+            models.Index(fields=['amount']),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
@@ -132,46 +201,69 @@ class PurchaseRequest(models.Model):
     @property
     def is_fully_approved(self):
         """Check if request has all required approvals"""
-        required_approvals = self.get_required_approval_levels()
-        current_approvals = set(
+        return self.get_required_approval_levels().issubset(self._approved_levels())
+
+    def _approved_levels(self):
+        """Levels already approved, read from the prefetch cache when present"""
+        if 'approvals' in getattr(self, '_prefetched_objects_cache', {}):
+            return {a.approval_level for a in self.approvals.all() if a.approved}
+        return set(
             self.approvals.filter(approved=True).values_list('approval_level', flat=True)
         )
-        return required_approvals.issubset(current_approvals)
     
     def get_required_approval_levels(self):
-        """Get required approval levels based on amount"""
-        if self.amount <= 1000:
-            return {1}  # Only Level 1 approval needed
-        elif self.amount <= 10000:
-            return {1, 2}  # Both Level 1 and 2 needed
-        else:
-            return {1, 2}  # For now, max 2 levels
-    
+        """Get required approval levels based on amount (memoized per instance)"""
+        levels = self.__dict__.get('_required_levels_cache')
+        if levels is None:
+            if self.amount <= 1000:
+                levels = {1}  # Only Level 1 approval needed
+            else:
+                levels = {1, 2}  # For now, max 2 levels
+            self.__dict__['_required_levels_cache'] = levels
+        return levels
+
     def get_pending_approvers(self):
-        """Get users who can provide next approval"""
+        """Get users who can provide next approval (memoized per instance)"""
+        approvers = self.__dict__.get('_pending_approvers_cache')
+        if approvers is None:
+            approvers = list(self.get_pending_approvers_queryset())
+            self.__dict__['_pending_approvers_cache'] = approvers
+        return approvers
+
+    # Columns the approver consumers actually read (membership checks,
+    # display names, role labels, log lines)
+    APPROVER_ONLY_FIELDS = ('id', 'username', 'first_name', 'last_name', 'role')
+
+    def get_pending_approvers_queryset(self):
+        """Build the queryset of users who can provide next approval"""
         required_levels = self.get_required_approval_levels()
-        approved_levels = set(
-            self.approvals.filter(approved=True).values_list('approval_level', flat=True)
-        )
-        pending_levels = required_levels - approved_levels
-        
+        pending_levels = required_levels - self._approved_levels()
+
         if not pending_levels:
             return User.objects.none()
-        
+
         next_level = min(pending_levels)
-        
+
         # Get users who can approve at this level
         if next_level == 1:
             return User.objects.filter(
                 role__in=[User.Role.APPROVER_LEVEL_1, User.Role.APPROVER_LEVEL_2, User.Role.ADMIN]
-            )
+            ).only(*self.APPROVER_ONLY_FIELDS)
         elif next_level == 2:
             return User.objects.filter(
                 role__in=[User.Role.APPROVER_LEVEL_2, User.Role.ADMIN]
-            )
-        
+            ).only(*self.APPROVER_ONLY_FIELDS)
+
         return User.objects.none()
 
+    def get_pending_approval_levels(self):
+        """Required approval levels still missing an approval"""
+        return self.get_required_approval_levels() - self._approved_levels()
+
+    def invalidate_approval_cache(self):
+        """Drop memoized approval state after approvals change"""
+        self.__dict__.pop('_pending_approvers_cache', None)
+
 
 class Approval(models.Model):
     """
@@ -195,6 +287,11 @@ class Approval(models.Model):
         db_table = 'approvals'
         unique_together = ['purchase_request', 'approval_level']
         ordering = ['approval_level', 'approved_at']
+        indexes = [
+            # Dashboard "my approvals" count; the per-request lookup is
+            # already covered by the unique_together index
+            models.Index(fields=['approver', 'approved']),
+        ]
     
     def __str__(self):
         status = "Approved" if self.approved else "Rejected"
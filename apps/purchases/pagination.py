@@ -0,0 +1,42 @@
+import hashlib
+
+from django.core.cache import cache
+from rest_framework import pagination
+
+# How long a pagination COUNT(*) may be reused
+COUNT_CACHE_TIMEOUT = 60
+
+
+class CachedCountPaginator(pagination.PageNumberPagination):
+    """
+    Page-number pagination that caches the COUNT(*) per user and filter
+    combination for a short window.
+
+    The count query dominates list latency on large tables. The first
+    page always recounts so fresh rows show up immediately; deeper pages
+    reuse the cached total.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count = cache.get(self._count_cache_key(request))
+        if count is None or self._is_first_page(request):
+            count = queryset.count()
+            cache.set(self._count_cache_key(request), count, COUNT_CACHE_TIMEOUT)
+
+        # Hand the precomputed total to Django's paginator
+        queryset.count = lambda: count
+        return super().paginate_queryset(queryset, request, view)
+
+    def _is_first_page(self, request):
+        return request.query_params.get(self.page_query_param, '1') == '1'
+
+    def _count_cache_key(self, request):
+        # Key on user + path + filters, excluding the page number so all
+        # pages of one result set share the cached count
+        params = sorted(
+            (key, values)
+            for key, values in request.query_params.lists()
+            if key != self.page_query_param
+        )
+        raw = '%s:%s:%s' % (request.user.id, request.path, params)
+        return 'purchases:count:%s' % hashlib.md5(raw.encode()).hexdigest()
@@ -1,22 +1,51 @@
+import copy
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from .models import PurchaseRequest, Approval, RequestItem, DocumentProcessingLog
 
 User = get_user_model()
 
+# Receipt upload validation constants
+ALLOWED_RECEIPT_TYPES = frozenset({
+    'application/pdf', 'image/jpeg', 'image/png', 'image/jpg'
+})
+MAX_RECEIPT_SIZE = 10 * 1024 * 1024  # 10MB
+
+
+def _context_user_id(context):
+    """Resolve the requesting user's id from serializer context.
+
+    Views can precompute 'user_id' once per request; fall back to the
+    request object for serializers instantiated manually.
+    """
+    user_id = context.get('user_id')
+    if user_id is not None:
+        return user_id
+    request = context.get('request')
+    if request and request.user and request.user.is_authenticated:
+        return request.user.id
+    return None
+
 
 class RequestItemSerializer(serializers.ModelSerializer):
     """
     Serializer for request items
     """
-    total_price = serializers.ReadOnlyField()
-    
+    # Writable so updates can match incoming items to existing rows;
+    # ignored on create
+    id = serializers.IntegerField(required=False)
+
+    # total_price is a stored column (maintained in RequestItem.save /
+    # bulk_create), so let ModelSerializer map it to a read-only
+    # DecimalField instead of the generic ReadOnlyField lookup
     class Meta:
         model = RequestItem
-        fields = [
+        fields = (
             'id', 'description', 'quantity', 'unit_price', 'total_price',
             'brand', 'model', 'specifications'
-        ]
+        )
 
 
 class ApprovalSerializer(serializers.ModelSerializer):
@@ -28,11 +57,11 @@ class ApprovalSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Approval
-        fields = [
+        fields = (
             'id', 'approver', 'approver_name', 'approver_role',
             'approval_level', 'approved', 'comments', 'approved_at'
-        ]
-        read_only_fields = ['id', 'approved_at', 'approver_name', 'approver_role']
+        )
+        read_only_fields = ('id', 'approved_at', 'approver_name', 'approver_role')
 
 
 class DocumentProcessingLogSerializer(serializers.ModelSerializer):
@@ -43,42 +72,60 @@ class DocumentProcessingLogSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = DocumentProcessingLog
-        fields = [
+        fields = (
             'id', 'process_type', 'process_type_display', 'status',
             'input_file', 'output_data', 'error_message',
             'processing_time', 'created_at'
-        ]
+        )
+
 
+class CachedFieldsSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that builds its field map once per class.
 
-class PurchaseRequestListSerializer(serializers.ModelSerializer):
+    DRF deep-copies the declared fields on every instantiation, which
+    adds up when a paginated list serializes a full page of rows. The
+    map is computed on first use and shallow-copied per instance; a
+    shallow copy is enough because binding only sets per-instance
+    attributes (field_name, parent, source_attrs) on the copy.
+    """
+
+    def get_fields(self):
+        cls = self.__class__
+        cached = cls.__dict__.get('_cached_fields')
+        if cached is None:
+            cached = super().get_fields()
+            cls._cached_fields = cached
+        return {name: copy.copy(field) for name, field in cached.items()}
+
+
+class PurchaseRequestListSerializer(CachedFieldsSerializer):
     """
     Simplified serializer for purchase request lists
     """
     created_by_name = serializers.CharField(source='created_by.full_name', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     priority_display = serializers.CharField(source='get_priority_display', read_only=True)
-    approval_count = serializers.SerializerMethodField()
+    # Filled by the queryset annotation (see views._with_approval_count)
+    approval_count = serializers.IntegerField(read_only=True)
     can_edit = serializers.SerializerMethodField()
     
     class Meta:
         model = PurchaseRequest
-        fields = [
+        fields = (
             'id', 'title', 'description', 'amount', 'status', 'status_display',
             'priority', 'priority_display', 'created_by', 'created_by_name',
             'vendor_name', 'expected_delivery_date', 'created_at', 'updated_at',
             'approval_count', 'can_edit'
-        ]
-    
-    def get_approval_count(self, obj):
-        return obj.approvals.filter(approved=True).count()
+        )
     
     def get_can_edit(self, obj):
-        request = self.context.get('request')
-        if not request or not request.user:
+        user_id = _context_user_id(self.context)
+        if user_id is None:
             return False
-        
+
         # Only creator can edit, and only if status is pending
-        return obj.created_by == request.user and obj.can_be_edited
+        return obj.created_by_id == user_id and obj.can_be_edited
 
 
 class PurchaseRequestDetailSerializer(serializers.ModelSerializer):
@@ -100,7 +147,7 @@ class PurchaseRequestDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = PurchaseRequest
-        fields = [
+        fields = (
             'id', 'title', 'description', 'amount', 'status', 'status_display',
             'priority', 'priority_display', 'created_by', 'created_by_name',
             'vendor_name', 'vendor_email', 'expected_delivery_date',
@@ -108,36 +155,41 @@ class PurchaseRequestDetailSerializer(serializers.ModelSerializer):
             'proforma_processed', 'po_generated', 'receipt_validated',
             'created_at', 'updated_at', 'items', 'approvals', 'processing_logs',
             'can_edit', 'can_approve', 'required_approval_levels', 'pending_approvers'
-        ]
+        )
     
     def get_can_edit(self, obj):
-        request = self.context.get('request')
-        if not request or not request.user:
+        user_id = _context_user_id(self.context)
+        if user_id is None:
             return False
-        return obj.created_by == request.user and obj.can_be_edited
-    
+        return obj.created_by_id == user_id and obj.can_be_edited
+
     def get_can_approve(self, obj):
-        request = self.context.get('request')
-        if not request or not request.user:
+        user_id = _context_user_id(self.context)
+        if user_id is None:
             return False
-        
-        user = request.user
-        
+
+        # Views can stash this flag once per request
+        can_approve = self.context.get('user_can_approve')
+        if can_approve is None:
+            can_approve = self.context['request'].user.can_approve_requests()
+
         # Check if user can approve and request is pending
-        if not user.can_approve_requests() or obj.status != PurchaseRequest.Status.PENDING:
+        if not can_approve or obj.status != PurchaseRequest.Status.PENDING:
             return False
-        
+
         # Check if user is in pending approvers list
-        pending_approvers = obj.get_pending_approvers()
-        return user in pending_approvers
+        return any(user.id == user_id for user in obj.get_pending_approvers())
     
     def get_required_approval_levels(self, obj):
         return list(obj.get_required_approval_levels())
     
     def get_pending_approvers(self, obj):
-        from apps.accounts.serializers import UserListSerializer
-        pending_approvers = obj.get_pending_approvers()
-        return UserListSerializer(pending_approvers, many=True).data
+        # Small fixed projection - plain dicts are much cheaper than
+        # instantiating a nested serializer per request
+        return [
+            {'id': user.id, 'full_name': user.full_name, 'role': user.role}
+            for user in obj.get_pending_approvers()
+        ]
 
 
 class PurchaseRequestCreateSerializer(serializers.ModelSerializer):
@@ -148,25 +200,40 @@ class PurchaseRequestCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = PurchaseRequest
-        fields = [
+        fields = (
             'title', 'description', 'amount', 'priority',
             'vendor_name', 'vendor_email', 'expected_delivery_date',
             'proforma', 'items'
-        ]
-    
+        )
+
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop('items', [])
         request = self.context['request']
         validated_data['created_by'] = request.user
-        
+
         purchase_request = PurchaseRequest.objects.create(**validated_data)
-        
-        # Create items
-        for item_data in items_data:
-            RequestItem.objects.create(purchase_request=purchase_request, **item_data)
-        
+
+        # Create items in a single INSERT instead of one per row
+        if items_data:
+            RequestItem.objects.bulk_create(
+                self._build_items(purchase_request, items_data)
+            )
+
         return purchase_request
 
+    @staticmethod
+    def _build_items(purchase_request, items_data):
+        """Build unsaved RequestItem instances with total_price precomputed
+        (bulk_create skips RequestItem.save())"""
+        items = []
+        for item_data in items_data:
+            item_data.pop('id', None)
+            item = RequestItem(purchase_request=purchase_request, **item_data)
+            item.total_price = item.quantity * item.unit_price
+            items.append(item)
+        return items
+
 
 class PurchaseRequestUpdateSerializer(serializers.ModelSerializer):
     """
@@ -176,12 +243,12 @@ class PurchaseRequestUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = PurchaseRequest
-        fields = [
+        fields = (
             'title', 'description', 'amount', 'priority',
             'vendor_name', 'vendor_email', 'expected_delivery_date',
             'proforma', 'items'
-        ]
-    
+        )
+
     def validate(self, attrs):
         if not self.instance.can_be_edited:
             raise serializers.ValidationError(
@@ -189,23 +256,57 @@ class PurchaseRequestUpdateSerializer(serializers.ModelSerializer):
             )
         return attrs
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         items_data = validated_data.pop('items', None)
         
-        # Update the main instance
+        # Update the main instance, writing only the changed columns
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        if validated_data:
+            instance.save(update_fields=[*validated_data, 'updated_at'])
         
         # Update items if provided
         if items_data is not None:
-            # Delete existing items and create new ones
-            instance.items.all().delete()
-            for item_data in items_data:
-                RequestItem.objects.create(purchase_request=instance, **item_data)
-        
+            self._sync_items(instance, items_data)
+
         return instance
 
+    # Item columns written on diff-based updates
+    ITEM_SYNC_FIELDS = (
+        'description', 'quantity', 'unit_price', 'total_price',
+        'brand', 'model', 'specifications'
+    )
+
+    def _sync_items(self, instance, items_data):
+        """
+        Diff incoming items against existing rows: update matching ids,
+        bulk-create new ones and delete only the removed rows, instead
+        of deleting and recreating the whole set
+        """
+        existing = {item.id: item for item in instance.items.all()}
+        to_update = []
+        to_create = []
+
+        for item_data in items_data:
+            item = existing.pop(item_data.pop('id', None), None)
+            if item is not None:
+                for attr, value in item_data.items():
+                    setattr(item, attr, value)
+                item.total_price = item.quantity * item.unit_price
+                to_update.append(item)
+            else:
+                item = RequestItem(purchase_request=instance, **item_data)
+                item.total_price = item.quantity * item.unit_price
+                to_create.append(item)
+
+        if to_update:
+            RequestItem.objects.bulk_update(to_update, fields=self.ITEM_SYNC_FIELDS)
+        if to_create:
+            RequestItem.objects.bulk_create(to_create)
+        if existing:
+            instance.items.filter(id__in=existing).delete()
+
 
 class ApprovalActionSerializer(serializers.Serializer):
     """
@@ -264,15 +365,15 @@ class ReceiptUploadSerializer(serializers.Serializer):
     receipt = serializers.FileField()
     
     def validate_receipt(self, value):
+        # Validate file size first - cheap attribute check before
+        # anything touches the file contents
+        if value.size > MAX_RECEIPT_SIZE:
+            raise serializers.ValidationError("Receipt file too large ( > 10MB )")
+
         # Validate file type
-        allowed_types = ['application/pdf', 'image/jpeg', 'image/png', 'image/jpg']
-        if value.content_type not in allowed_types:
+        if value.content_type not in ALLOWED_RECEIPT_TYPES:
             raise serializers.ValidationError(
                 "Only PDF and image files are allowed for receipts"
             )
-        
-        # Validate file size (10MB limit)
-        if value.size > 10 * 1024 * 1024:
-            raise serializers.ValidationError("Receipt file too large ( > 10MB )")
-        
+
         return value
\ No newline at end of file
@@ -1,16 +1,23 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from django.db import models
+from django.db.models import Count, Max, Prefetch, Q, Sum
+from django.db.models.functions import Greatest
+from django.contrib.postgres.search import TrigramSimilarity
 
 from .models import PurchaseRequest, Approval, RequestItem, DocumentProcessingLog
+from .pagination import CachedCountPaginator
 from .serializers import (
     PurchaseRequestListSerializer,
     PurchaseRequestDetailSerializer,
@@ -24,19 +31,130 @@ from apps.accounts.permissions import (
     IsOwnerOrReadOnly,
     IsApproverUser,
     IsFinanceUser,
-    CanApprovePurchaseRequest,
-    CanAccessPurchaseRequest
+    CanApprovePurchaseRequest
 )
+import hashlib
 import logging
+from decimal import Decimal, InvalidOperation
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-class PurchaseRequestListCreateView(generics.ListCreateAPIView):
+# Columns PurchaseRequestListSerializer reads - keeps list SELECTs narrow
+LIST_ONLY_FIELDS = (
+    'id', 'title', 'description', 'amount', 'status', 'priority',
+    'created_by', 'vendor_name', 'expected_delivery_date',
+    'created_at', 'updated_at',
+    'created_by__first_name', 'created_by__last_name',
+)
+
+
+# Minimum trigram similarity for a search hit on PostgreSQL
+SEARCH_MIN_SIMILARITY = 0.1
+
+# Status values bound once at import - these sit on per-request paths
+_PENDING = PurchaseRequest.Status.PENDING
+_APPROVED = PurchaseRequest.Status.APPROVED
+_REJECTED = PurchaseRequest.Status.REJECTED
+
+# Role value -> human-readable label, resolved once at import
+ROLE_DISPLAY = dict(User.Role.choices)
+
+
+def _apply_search(queryset, search):
+    """
+    Filter on title/description. On PostgreSQL this uses the pg_trgm GIN
+    indexes (migration 0002) and ranks by similarity; elsewhere it falls
+    back to the portable icontains scan.
+    """
+    if connection.vendor == 'postgresql':
+        return queryset.annotate(
+            search_rank=Greatest(
+                TrigramSimilarity('title', search),
+                TrigramSimilarity('description', search),
+            )
+        ).filter(search_rank__gt=SEARCH_MIN_SIMILARITY)
+
+    return queryset.filter(
+        Q(title__icontains=search) |
+        Q(description__icontains=search)
+    )
+
+
+def _dec(value):
+    """Coerce a query param to Decimal; None when missing or invalid"""
+    if value is None:
+        return None
+    try:
+        parsed = Decimal(value)
+    except InvalidOperation:
+        return None
+    # Decimal accepts 'nan'/'inf', which make no sense as range bounds
+    return parsed if parsed.is_finite() else None
+
+
+def _with_approval_count(queryset):
+    """Annotate the approved-approval count read by the list serializer"""
+    return queryset.annotate(
+        approval_count=Count(
+            'approvals', filter=Q(approvals__approved=True)
+        )
+    )
+
+
+def _set_status(purchase_request, new_status):
+    """Flip status with a narrow UPDATE instead of a full-row save()"""
+    PurchaseRequest.objects.filter(pk=purchase_request.pk).update(
+        status=new_status, updated_at=timezone.now()
+    )
+    purchase_request.status = new_status
+
+
+class UserContextMixin:
+    """
+    Compute per-user flags once per request instead of per serialized row
+    """
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        user = self.request.user
+        if user.is_authenticated:
+            context['user_id'] = user.id
+            context['user_can_approve'] = user.can_approve_requests()
+        return context
+
+
+class ChunkedListMixin:
+    """
+    Serialize unpaginated list responses from iterator() so model and
+    serializer objects are built in chunks instead of all at once. Note
+    the bound only covers Python objects: with server-side cursors
+    disabled (the PgBouncer deployment), the driver still buffers the
+    raw result set client-side before iteration starts.
+    """
+    iterator_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(
+            queryset.iterator(chunk_size=self.iterator_chunk_size),
+            many=True
+        )
+        return Response(serializer.data)
+
+
+class PurchaseRequestListCreateView(UserContextMixin, generics.ListCreateAPIView):
     """
     List purchase requests or create a new one
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CachedCountPaginator
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -45,49 +163,58 @@ class PurchaseRequestListCreateView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         user = self.request.user
-        queryset = PurchaseRequest.objects.all()
-        
+        params = self.request.query_params
+
+        # Accumulate everything into one Q and filter once - each
+        # .filter() call clones the queryset, so six chained calls meant
+        # six clones per request
+        filters = Q()
+
         # Filter based on user role
         if user.is_staff_user():
             # Staff can only see their own requests
-            queryset = queryset.filter(created_by=user)
+            filters &= Q(created_by=user)
         elif user.can_approve_requests():
             # Approvers can see all requests
             pass
         elif user.can_access_finance():
             # Finance can see approved requests
-            queryset = queryset.filter(status=PurchaseRequest.Status.APPROVED)
+            filters &= Q(status=_APPROVED)
         else:
             # Default: only own requests
-            queryset = queryset.filter(created_by=user)
-        
+            filters &= Q(created_by=user)
+
         # Apply filters
-        status_filter = self.request.query_params.get('status')
+        status_filter = params.get('status')
         if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        priority_filter = self.request.query_params.get('priority')
+            filters &= Q(status=status_filter)
+
+        priority_filter = params.get('priority')
         if priority_filter:
-            queryset = queryset.filter(priority=priority_filter)
-        
-        # Filter by amount range
-        min_amount = self.request.query_params.get('min_amount')
-        if min_amount:
-            queryset = queryset.filter(amount__gte=min_amount)
-        
-        max_amount = self.request.query_params.get('max_amount')
-        if max_amount:
-            queryset = queryset.filter(amount__lte=max_amount)
-        
+            filters &= Q(priority=priority_filter)
+
+        # Filter by amount range, coerced once here; an invalid value is
+        # ignored instead of becoming a 500 deep in the SQL compiler
+        min_amount = _dec(params.get('min_amount'))
+        if min_amount is not None:
+            filters &= Q(amount__gte=min_amount)
+
+        max_amount = _dec(params.get('max_amount'))
+        if max_amount is not None:
+            filters &= Q(amount__lte=max_amount)
+
+        queryset = PurchaseRequest.objects.filter(filters)
+
         # Search in title and description
-        search = self.request.query_params.get('search')
+        search = params.get('search')
         if search:
-            queryset = queryset.filter(
-                models.Q(title__icontains=search) | 
-                models.Q(description__icontains=search)
-            )
-        
-        return queryset.order_by('-created_at')
+            queryset = _apply_search(queryset, search)
+
+        # JOIN the creator in the same query (created_by_name) and keep
+        # the SELECT narrow - list rows don't need the file columns
+        queryset = queryset.select_related('created_by').only(*LIST_ONLY_FIELDS)
+
+        return _with_approval_count(queryset).order_by('-created_at')
     
     @swagger_auto_schema(
         operation_description="List purchase requests with optional filtering",
@@ -114,36 +241,96 @@ class PurchaseRequestListCreateView(generics.ListCreateAPIView):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
             purchase_request = serializer.save()
-            
-            # Return detailed view of created request
+
+            # Return detailed view of created request. Re-fetch with the
+            # relations the detail serializer walks so serializing the
+            # fresh row doesn't fire a query per nested field
+            purchase_request = PurchaseRequest.objects.select_related(
+                'created_by'
+            ).prefetch_related(
+                'items', 'approvals__approver', 'processing_logs'
+            ).get(pk=purchase_request.pk)
+
             detail_serializer = PurchaseRequestDetailSerializer(
                 purchase_request,
-                context={'request': request}
+                context=self.get_serializer_context()
             )
             return Response(detail_serializer.data, status=status.HTTP_201_CREATED)
-        
+
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PurchaseRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PurchaseRequestDetailView(UserContextMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a purchase request
     """
-    queryset = PurchaseRequest.objects.all()
     serializer_class = PurchaseRequestDetailSerializer
-    permission_classes = [permissions.IsAuthenticated, CanAccessPurchaseRequest]
-    
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        # Access rules applied in SQL via for_user(): a forbidden row is
+        # never fetched and 404s in the same query, replacing the
+        # fetch-then-reject CanAccessPurchaseRequest object check
+        return PurchaseRequest.objects.for_user(
+            self.request.user
+        ).select_related('created_by').prefetch_related(
+            Prefetch(
+                'approvals', queryset=Approval.objects.select_related('approver')
+            ),
+            'items',
+            'processing_logs'
+        )
+
+
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return PurchaseRequestUpdateSerializer
         return PurchaseRequestDetailSerializer
     
+    def _current_etag(self, pk):
+        """Validator built from the request and latest approval timestamps.
+
+        Queried through for_user() so the same access rules apply as to
+        the GET itself: a caller who would 404 on a plain fetch gets no
+        validator (and therefore no 304) either.
+
+        The user id is part of the hash because the representation is
+        per-user (can_edit/can_approve depend on the caller) - two
+        users must never share a validator for different bodies.
+        """
+        stamps = PurchaseRequest.objects.for_user(
+            self.request.user
+        ).filter(pk=pk).annotate(
+            last_approval=Max('approvals__approved_at')
+        ).values_list('updated_at', 'last_approval').first()
+        if stamps is None:
+            return None
+        validator = (self.request.user.id,) + stamps
+        return '"%s"' % hashlib.md5(repr(validator).encode()).hexdigest()
+
     @swagger_auto_schema(
         operation_description="Get purchase request details",
         responses={200: PurchaseRequestDetailSerializer}
     )
     def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+        # Conditional GET: skip serialization entirely when the client
+        # already holds the current representation
+        etag = self._current_etag(kwargs.get('pk'))
+        if etag and request.headers.get('If-None-Match') == etag:
+            # RFC 7232: the 304 must repeat the validator so caches
+            # can refresh their stored response metadata
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            patch_vary_headers(response, ('Authorization',))
+            return response
+
+        response = super().get(request, *args, **kwargs)
+        if etag and response.status_code == 200:
+            response['ETag'] = etag
+            # The body is per-user; shared caches must key on the
+            # credential, not just the URL
+            patch_vary_headers(response, ('Authorization',))
+        return response
     
     @swagger_auto_schema(
         operation_description="Update purchase request (owner only, pending status)",
@@ -151,9 +338,9 @@ class PurchaseRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
     )
     def patch(self, request, *args, **kwargs):
         instance = self.get_object()
-        
-        # Check if user can edit
-        if instance.created_by != request.user:
+
+        # Check if user can edit (id comparison avoids loading the User row)
+        if instance.created_by_id != request.user.id:
             return Response(
                 {'error': 'You can only edit your own requests'},
                 status=status.HTTP_403_FORBIDDEN
@@ -165,23 +352,15 @@ class PurchaseRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        response = super().patch(request, *args, **kwargs)
-        
-        # Return detailed view after update
-        if response.status_code == 200:
-            detail_serializer = PurchaseRequestDetailSerializer(
-                instance,
-                context={'request': request}
-            )
-            return Response(detail_serializer.data)
-        
-        return response
+        # super().patch() already serializes the updated state; the old
+        # re-serialization here worked from the pre-update snapshot
+        return super().patch(request, *args, **kwargs)
     
     def delete(self, request, *args, **kwargs):
         instance = self.get_object()
-        
-        # Check if user can delete
-        if instance.created_by != request.user:
+
+        # Check if user can delete (id comparison avoids loading the User row)
+        if instance.created_by_id != request.user.id:
             return Response(
                 {'error': 'You can only delete your own requests'},
                 status=status.HTTP_403_FORBIDDEN
@@ -215,35 +394,48 @@ class ApprovalActionView(APIView):
         try:
             purchase_request = get_object_or_404(PurchaseRequest, pk=pk)
             user = request.user
-            
-            # Enhanced logging for debugging
-            logger.info(f"Approval attempt: User {user.username} ({user.role}) for request {pk}")
-            logger.info(f"Request status: {purchase_request.status}")
-            logger.info(f"Request amount: {purchase_request.amount}")
-            logger.info(f"User approval level: {user.get_approval_level()}")
-            logger.info(f"Required levels: {purchase_request.get_required_approval_levels()}")
-            logger.info(f"Pending approvers: {[u.username for u in purchase_request.get_pending_approvers()]}")
-            
+
+            # Workflow state computed once up front and reused below
+            # (the model memoizes these, but explicit locals keep every
+            # later use on the same values)
+            user_level = user.get_approval_level()
+            required_levels = purchase_request.get_required_approval_levels()
+            pending_approvers = purchase_request.get_pending_approvers()
+
+            # Debug-only: skips the username list build (and the string
+            # formatting) entirely at production log levels
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Approval attempt: user=%s role=%s request=%s status=%s "
+                    "amount=%s user_level=%s required=%s pending_approvers=%s",
+                    user.username, user.role, pk, purchase_request.status,
+                    purchase_request.amount, user_level, required_levels,
+                    [u.username for u in pending_approvers],
+                )
+
             # Basic permission checks
             if not user.can_approve_requests():
-                logger.warning(f"User {user.username} cannot approve requests (role: {user.role})")
+                logger.warning("User %s cannot approve requests (role: %s)", user.username, user.role)
                 return Response(
                     {'error': 'You do not have permission to approve requests'},
                     status=status.HTTP_403_FORBIDDEN
                 )
             
             # Check if request is pending
-            if purchase_request.status != PurchaseRequest.Status.PENDING:
-                logger.warning(f"Request {pk} is not pending (status: {purchase_request.status})")
+            if purchase_request.status != _PENDING:
+                logger.warning("Request %s is not pending (status: %s)", pk, purchase_request.status)
                 return Response(
                     {'error': f'This request is {purchase_request.status} and cannot be approved/rejected'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
             # Check if user is in pending approvers (more flexible check)
-            pending_approvers = purchase_request.get_pending_approvers()
             if user not in pending_approvers and user.role != User.Role.ADMIN:
-                logger.warning(f"User {user.username} not in pending approvers: {[u.username for u in pending_approvers]}")
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(
+                        "User %s not in pending approvers: %s",
+                        user.username, [u.username for u in pending_approvers]
+                    )
                 return Response(
                     {'error': 'You cannot approve this request at this time. It may require a different approval level.'},
                     status=status.HTTP_403_FORBIDDEN
@@ -256,30 +448,43 @@ class ApprovalActionView(APIView):
             )
             
             if not serializer.is_valid():
-                logger.error(f"Serializer validation failed: {serializer.errors}")
+                logger.error("Serializer validation failed: %s", serializer.errors)
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             
             approved = serializer.validated_data['approved']
             comments = serializer.validated_data.get('comments', '')
             
-            logger.info(f"Processing approval: approved={approved}, comments='{comments[:50]}...'")
+            logger.debug("Processing approval: approved=%s", approved)
             
             with transaction.atomic():
+                # Serialize concurrent approvers: re-read the request
+                # under a row lock so the status decision below sees
+                # every committed approval
+                purchase_request = PurchaseRequest.objects.select_for_update().get(
+                    pk=purchase_request.pk
+                )
+
+                # Approval-set state read once under the lock; after the
+                # upsert it is advanced in Python rather than re-queried
+                required_levels = purchase_request.get_required_approval_levels()
+                approved_levels = set(
+                    purchase_request.approvals.filter(
+                        approved=True
+                    ).values_list('approval_level', flat=True)
+                )
+
                 # Determine approval level
-                user_approval_level = user.get_approval_level()
-                
+                user_approval_level = user_level
+
                 if user_approval_level == 999:  # Admin can approve at any level
-                    # Find the next required level
-                    required_levels = purchase_request.get_required_approval_levels()
-                    approved_levels = set(
-                        purchase_request.approvals.filter(approved=True).values_list('approval_level', flat=True)
+                    # Act on the lowest level that is still pending
+                    user_approval_level = min(
+                        required_levels - approved_levels, default=1
                     )
-                    pending_levels = required_levels - approved_levels
-                    user_approval_level = min(pending_levels) if pending_levels else 1
-                    logger.info(f"Admin approval at level: {user_approval_level}")
-                
-                # Create or update approval record
-                approval, created = Approval.objects.get_or_create(
+                    logger.debug("Admin approval at level: %s", user_approval_level)
+
+                # Create or update the approval record in one flow
+                approval, created = Approval.objects.update_or_create(
                     purchase_request=purchase_request,
                     approval_level=user_approval_level,
                     defaults={
@@ -289,25 +494,20 @@ class ApprovalActionView(APIView):
                         'approved_at': timezone.now()
                     }
                 )
-                
-                if not created:
-                    # Update existing approval
-                    logger.info(f"Updating existing approval at level {user_approval_level}")
-                    approval.approver = user
-                    approval.approved = approved
-                    approval.comments = comments
-                    approval.approved_at = timezone.now()
-                    approval.save()
-                else:
-                    logger.info(f"Created new approval at level {user_approval_level}")
-                
+                logger.debug(
+                    "%s approval at level %s",
+                    'Created' if created else 'Updated', user_approval_level
+                )
+
+                # Approval state changed - drop the memoized approver data
+                purchase_request.invalidate_approval_cache()
+
                 # Update purchase request status
                 if not approved:
                     # Any rejection rejects the entire request
-                    purchase_request.status = PurchaseRequest.Status.REJECTED
-                    purchase_request.save()
-                    
-                    logger.info(f"Request {pk} rejected by {user.username}")
+                    _set_status(purchase_request, _REJECTED)
+
+                    logger.info("Request %s rejected by %s", pk, user.username)
                     
                     return Response({
                         'message': 'Request rejected successfully',
@@ -315,14 +515,17 @@ class ApprovalActionView(APIView):
                         'approval_level': user_approval_level
                     })
                 else:
-                    # Check if all required approvals are complete
-                    logger.info(f"Checking if fully approved: {purchase_request.is_fully_approved}")
-                    
-                    if purchase_request.is_fully_approved:
-                        purchase_request.status = PurchaseRequest.Status.APPROVED
-                        purchase_request.save()
-                        
-                        logger.info(f"Request {pk} fully approved")
+                    # The upsert just approved user_approval_level;
+                    # advance the set read above instead of re-querying
+                    # approvals (the row lock rules out racing writes)
+                    approved_levels.add(user_approval_level)
+                    pending_levels = required_levels - approved_levels
+                    logger.debug("Pending approval levels after approval: %s", pending_levels)
+
+                    if not pending_levels:
+                        _set_status(purchase_request, _APPROVED)
+
+                        logger.info("Request %s fully approved", pk)
                         
                         # Trigger PO generation (implement this in documents app)
                         # trigger_po_generation.delay(purchase_request.id)
@@ -333,7 +536,7 @@ class ApprovalActionView(APIView):
                             'approval_level': user_approval_level
                         })
                     else:
-                        logger.info(f"Request {pk} partially approved - waiting for more approvals")
+                        logger.debug("Request %s partially approved - waiting for more approvals", pk)
                         
                         return Response({
                             'message': 'Approval recorded - waiting for additional approvals',
@@ -343,7 +546,7 @@ class ApprovalActionView(APIView):
                         })
         
         except Exception as e:
-            logger.error(f"Unexpected error in approval: {str(e)}", exc_info=True)
+            logger.error("Unexpected error in approval: %s", e, exc_info=True)
             return Response(
                 {'error': 'An unexpected error occurred. Please try again.'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -369,14 +572,14 @@ class ReceiptUploadView(APIView):
         purchase_request = get_object_or_404(PurchaseRequest, pk=pk)
         
         # Check if user can upload receipt (owner or finance)
-        if not (purchase_request.created_by == request.user or request.user.can_access_finance()):
+        if not (purchase_request.created_by_id == request.user.id or request.user.can_access_finance()):
             return Response(
                 {'error': 'You cannot upload receipts for this request'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
         # Check if request is approved
-        if purchase_request.status != PurchaseRequest.Status.APPROVED:
+        if purchase_request.status != _APPROVED:
             return Response(
                 {'error': 'Receipts can only be uploaded for approved requests'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -386,28 +589,41 @@ class ReceiptUploadView(APIView):
         
         if serializer.is_valid():
             purchase_request.receipt = serializer.validated_data['receipt']
-            purchase_request.save()
-            
-            # Trigger receipt validation (we'll implement this in documents app)
-            # trigger_receipt_validation.delay(purchase_request.id)
-            
+            # Only the receipt column changed ('updated_at' keeps
+            # auto_now firing on a narrowed save)
+            purchase_request.save(update_fields=['receipt', 'updated_at'])
+
+            # Run OCR/validation off the request thread; the worker (or
+            # the eager fallback without Redis) picks it up from here
+            from apps.documents.tasks import validate_receipt_document
+            try:
+                validate_receipt_document.delay(str(purchase_request.id))
+            except Exception:
+                # Don't fail the upload because validation couldn't start
+                logger.exception(f"Could not queue receipt validation for {pk}")
+
             return Response({
                 'message': 'Receipt uploaded successfully - validation initiated',
                 'receipt_url': request.build_absolute_uri(purchase_request.receipt.url)
-            })
-        
+            }, status=status.HTTP_202_ACCEPTED)
+
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class MyRequestsView(generics.ListAPIView):
+class MyRequestsView(ChunkedListMixin, UserContextMixin, generics.ListAPIView):
     """
     Get current user's purchase requests
     """
     serializer_class = PurchaseRequestListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CachedCountPaginator
     
     def get_queryset(self):
-        return self.request.user.purchase_requests.all().order_by('-created_at')
+        return _with_approval_count(
+            self.request.user.purchase_requests.select_related(
+                'created_by'
+            ).only(*LIST_ONLY_FIELDS)
+        ).order_by('-created_at')
     
     @swagger_auto_schema(
         operation_description="Get current user's purchase requests",
@@ -417,22 +633,23 @@ class MyRequestsView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
-class PendingApprovalsView(generics.ListAPIView):
+class PendingApprovalsView(UserContextMixin, generics.ListAPIView):
     """
     Get requests pending current user's approval
     """
     serializer_class = PurchaseRequestListSerializer
     permission_classes = [permissions.IsAuthenticated, IsApproverUser]
-    
+    pagination_class = CachedCountPaginator
+
     def get_queryset(self):
-        user = self.request.user
-        pending_requests = []
-        
-        for request in PurchaseRequest.objects.filter(status=PurchaseRequest.Status.PENDING):
-            if user in request.get_pending_approvers():
-                pending_requests.append(request.id)
-        
-        return PurchaseRequest.objects.filter(id__in=pending_requests).order_by('-created_at')
+        # The pending-approver workflow rules live in SQL on the
+        # manager, shared with the dashboard's approver stats
+        queryset = PurchaseRequest.objects.pending_for_approver(
+            self.request.user
+        )
+        return _with_approval_count(
+            queryset.select_related('created_by').only(*LIST_ONLY_FIELDS)
+        ).order_by('-created_at')
     
     @swagger_auto_schema(
         operation_description="Get requests pending current user's approval",
@@ -442,18 +659,56 @@ class PendingApprovalsView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
-class FinanceRequestsView(generics.ListAPIView):
+class FinanceRequestsView(ChunkedListMixin, UserContextMixin, generics.ListAPIView):
     """
     Get approved requests for finance team
     """
     serializer_class = PurchaseRequestListSerializer
     permission_classes = [permissions.IsAuthenticated, IsFinanceUser]
+    pagination_class = CachedCountPaginator
     
     def get_queryset(self):
-        return PurchaseRequest.objects.filter(
-            status=PurchaseRequest.Status.APPROVED
+        return _with_approval_count(
+            PurchaseRequest.objects.filter(
+                status=_APPROVED
+            ).select_related('created_by').only(*LIST_ONLY_FIELDS)
         ).order_by('-updated_at')
-    
+
+    def list(self, request, *args, **kwargs):
+        # ?stream=1: NDJSON export for pulling the full approved set
+        # without paging the API. Rows are fetched in pk-keyset batches,
+        # so peak memory stays at one batch even where server-side
+        # cursors are disabled for PgBouncer.
+        if request.query_params.get('stream') == '1':
+            queryset = self.filter_queryset(self.get_queryset())
+            return StreamingHttpResponse(
+                self._stream_ndjson(queryset),
+                content_type='application/x-ndjson'
+            )
+        return super().list(request, *args, **kwargs)
+
+    def _stream_ndjson(self, queryset):
+        renderer = JSONRenderer()
+        context = self.get_serializer_context()
+        # Explicit pk-keyset batches instead of iterator(): with
+        # DISABLE_SERVER_SIDE_CURSORS the driver buffers the whole
+        # result before iterator() yields anything, so a single query
+        # would hold the full export in memory. Each batch is its own
+        # bounded query; pk order makes the keyset stable and unique.
+        batches = queryset.order_by('pk')
+        last_pk = None
+        while True:
+            batch = batches
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            rows = list(batch[:self.iterator_chunk_size])
+            if not rows:
+                break
+            for row in rows:
+                data = PurchaseRequestListSerializer(row, context=context).data
+                yield renderer.render(data) + b'\n'
+            last_pk = rows[-1].pk
+
     @swagger_auto_schema(
         operation_description="Get approved requests for finance team",
         responses={200: PurchaseRequestListSerializer(many=True)}
@@ -462,6 +717,14 @@ class FinanceRequestsView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
+# How long computed dashboard stats may be reused
+DASHBOARD_STATS_TIMEOUT = 30
+
+# How long workflow info may be reused; short enough that a fresh
+# approval shows up almost immediately for polling clients
+WORKFLOW_INFO_TIMEOUT = 15
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def purchase_dashboard_stats(request):
@@ -469,49 +732,81 @@ def purchase_dashboard_stats(request):
     Get purchase-related dashboard statistics
     """
     user = request.user
-    
-    # Base stats
+
+    # Stats change slowly relative to how often dashboards poll them;
+    # a short TTL keeps cache hits at zero queries
+    cache_key = 'pdash:%s:%s' % (user.id, user.role)
+    stats = cache.get(cache_key)
+    if stats is None:
+        stats = _compute_dashboard_stats(user)
+        cache.set(cache_key, stats, DASHBOARD_STATS_TIMEOUT)
+
+    return Response(stats)
+
+
+def _compute_dashboard_stats(user):
+    """Build the dashboard stats dict for a user (uncached)"""
+    # Base stats - one query with filtered counts instead of four COUNTs
+    base = PurchaseRequest.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status=_PENDING)),
+        approved=Count('id', filter=Q(status=_APPROVED)),
+        rejected=Count('id', filter=Q(status=_REJECTED)),
+    )
     stats = {
-        'total_requests': PurchaseRequest.objects.count(),
-        'pending_requests': PurchaseRequest.objects.filter(status=PurchaseRequest.Status.PENDING).count(),
-        'approved_requests': PurchaseRequest.objects.filter(status=PurchaseRequest.Status.APPROVED).count(),
-        'rejected_requests': PurchaseRequest.objects.filter(status=PurchaseRequest.Status.REJECTED).count(),
+        'total_requests': base['total'],
+        'pending_requests': base['pending'],
+        'approved_requests': base['approved'],
+        'rejected_requests': base['rejected'],
     }
     
     # User-specific stats
     if user.is_staff_user():
-        my_requests = user.purchase_requests.all()
+        # One aggregate instead of four COUNTs plus a Sum
+        mine = user.purchase_requests.aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status=_PENDING)),
+            approved=Count('id', filter=Q(status=_APPROVED)),
+            rejected=Count('id', filter=Q(status=_REJECTED)),
+            total_value=Sum('amount', filter=Q(status=_APPROVED)),
+        )
         stats['my_stats'] = {
-            'total': my_requests.count(),
-            'pending': my_requests.filter(status=PurchaseRequest.Status.PENDING).count(),
-            'approved': my_requests.filter(status=PurchaseRequest.Status.APPROVED).count(),
-            'rejected': my_requests.filter(status=PurchaseRequest.Status.REJECTED).count(),
-            'total_value': sum(req.amount for req in my_requests.filter(status=PurchaseRequest.Status.APPROVED)),
+            'total': mine['total'],
+            'pending': mine['pending'],
+            'approved': mine['approved'],
+            'rejected': mine['rejected'],
+            'total_value': mine['total_value'] or 0,
         }
     
     elif user.can_approve_requests():
-        # Get pending approvals for this user
-        pending_for_user = []
-        for req in PurchaseRequest.objects.filter(status=PurchaseRequest.Status.PENDING):
-            if user in req.get_pending_approvers():
-                pending_for_user.append(req)
-        
+        # Same single-query rule as PendingApprovalsView instead of
+        # calling get_pending_approvers() on every pending row
+        pending = PurchaseRequest.objects.pending_for_approver(user).aggregate(
+            cnt=Count('id'), val=Sum('amount')
+        )
         stats['approval_stats'] = {
-            'pending_my_approval': len(pending_for_user),
-            'total_pending_value': sum(req.amount for req in pending_for_user),
+            'pending_my_approval': pending['cnt'],
+            'total_pending_value': pending['val'] or 0,
             'my_approvals_count': Approval.objects.filter(approver=user, approved=True).count(),
         }
     
     elif user.can_access_finance():
-        approved_requests = PurchaseRequest.objects.filter(status=PurchaseRequest.Status.APPROVED)
+        # One aggregate over the approved set instead of three COUNTs
+        # plus a Sum
+        finance = PurchaseRequest.objects.filter(status=_APPROVED).aggregate(
+            cnt=Count('id'),
+            val=Sum('amount'),
+            pending_po=Count('id', filter=Q(po_generated=False)),
+            pending_receipts=Count('id', filter=Q(receipt='')),
+        )
         stats['finance_stats'] = {
-            'approved_count': approved_requests.count(),
-            'approved_value': sum(req.amount for req in approved_requests),
-            'pending_po': approved_requests.filter(po_generated=False).count(),
-            'pending_receipts': approved_requests.filter(receipt='').count(),
+            'approved_count': finance['cnt'],
+            'approved_value': finance['val'] or 0,
+            'pending_po': finance['pending_po'],
+            'pending_receipts': finance['pending_receipts'],
         }
-    
-    return Response(stats)
+
+    return stats
 
 
 @api_view(['GET'])
@@ -520,15 +815,29 @@ def request_workflow_info(request, pk):
     """
     Get detailed workflow information for a specific request
     """
-    purchase_request = get_object_or_404(PurchaseRequest, pk=pk)
-    
-    # Check access permission
-    if not CanAccessPurchaseRequest().has_object_permission(request, None, purchase_request):
-        return Response(
-            {'error': 'You cannot access this request'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
+    # Per-user cache: clients poll this while waiting on approvals, and
+    # a hit answers without touching the database. Keyed on the user so
+    # can_approve stays correct; only computed (access-checked)
+    # responses are ever stored.
+    cache_key = 'wfinfo:%s:%s' % (pk, request.user.id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return Response(cached)
+
+    # for_user() folds the CanAccessPurchaseRequest rules into the
+    # lookup query; rows the user may not see 404 without being fetched
+    purchase_request = get_object_or_404(
+        PurchaseRequest.objects.for_user(
+            request.user
+        ).select_related('created_by').prefetch_related(
+            Prefetch(
+                'approvals', queryset=Approval.objects.select_related('approver')
+            )
+        ),
+        pk=pk
+    )
+
+
     workflow_info = {
         'required_levels': list(purchase_request.get_required_approval_levels()),
         'current_approvals': [],
@@ -547,25 +856,31 @@ def request_workflow_info(request, pk):
             'approved_at': approval.approved_at,
         })
     
-    # Get pending approvers
-    pending_approvers = purchase_request.get_pending_approvers()
+    # Get pending approvers in one narrow batch query
+    pending_approvers = list(
+        purchase_request.get_pending_approvers_queryset().values(
+            'id', 'first_name', 'last_name', 'role'
+        )
+    )
     for approver in pending_approvers:
         workflow_info['pending_approvers'].append({
-            'id': approver.id,
-            'name': approver.full_name,
-            'role': approver.get_role_display(),
+            'id': approver['id'],
+            'name': ('%s %s' % (approver['first_name'], approver['last_name'])).strip(),
+            'role': ROLE_DISPLAY.get(approver['role'], approver['role']),
         })
-    
+
     # Check if current user can approve
-    workflow_info['can_approve'] = request.user in pending_approvers
+    workflow_info['can_approve'] = any(
+        approver['id'] == request.user.id for approver in pending_approvers
+    )
     
     # Determine next action
-    if purchase_request.status == PurchaseRequest.Status.PENDING:
+    if purchase_request.status == _PENDING:
         if workflow_info['pending_approvers']:
             workflow_info['next_action'] = f"Waiting for approval from {workflow_info['pending_approvers'][0]['role']}"
         else:
             workflow_info['next_action'] = "All approvals complete"
-    elif purchase_request.status == PurchaseRequest.Status.APPROVED:
+    elif purchase_request.status == _APPROVED:
         if not purchase_request.po_generated:
             workflow_info['next_action'] = "Generate Purchase Order"
         elif not purchase_request.receipt:
@@ -574,5 +889,6 @@ def request_workflow_info(request, pk):
             workflow_info['next_action'] = "Complete"
     else:
         workflow_info['next_action'] = "Rejected"
-    
+
+    cache.set(cache_key, workflow_info, WORKFLOW_INFO_TIMEOUT)
     return Response(workflow_info)
\ No newline at end of file
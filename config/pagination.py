@@ -0,0 +1,35 @@
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Project-wide default paginator.
+
+    Keyset (cursor) pagination instead of page numbers: no COUNT(*) per
+    list request and no OFFSET scans that grow with the page depth.
+    Views that need page numbers and totals opt back in with an explicit
+    pagination_class (the purchases list views use CachedCountPaginator).
+    """
+    page_size = 20
+    ordering = '-created_at'
+
+    def get_ordering(self, request, queryset, view):
+        # The base class defers entirely to an OrderingFilter backend
+        # when one is configured - and the project-wide
+        # DEFAULT_FILTER_BACKENDS include it. For views without an
+        # `ordering` attribute and requests without ?ordering=, that
+        # filter returns None and the base class asserts (a 500 on
+        # every plain list request). Fall back to our own ordering.
+        ordering_filters = [
+            filter_cls for filter_cls in getattr(view, 'filter_backends', [])
+            if hasattr(filter_cls, 'get_ordering')
+        ]
+        if ordering_filters:
+            filter_ordering = ordering_filters[0]().get_ordering(
+                request, queryset, view
+            )
+            if filter_ordering is None:
+                if isinstance(self.ordering, str):
+                    return (self.ordering,)
+                return tuple(self.ordering)
+        return super().get_ordering(request, queryset, view)
@@ -1,47 +1,70 @@
-import os
+import logging
+import re
+from datetime import timedelta
 from pathlib import Path
-from decouple import config, Csv
-import dj_database_url
+from decouple import AutoConfig
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# One config instance rooted at the project: the .env file is located
+# and parsed once here, instead of each call inspecting the caller's
+# stack frame to find where to search
+config = AutoConfig(search_path=BASE_DIR)
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-change-me-in-production')
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = config('DEBUG', default=True, cast=bool)
 
-# ALLOWED_HOSTS configuration
-ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1, https://procure-to-pay-backend-y65j.onrender.com/', cast=Csv())
+# Comma-separated env lists; plain split instead of decouple's Csv(),
+# which builds a regex-backed parser per variable
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# ALLOWED_HOSTS configuration. The default used to contain a full URL
+# (scheme and trailing slash included) which can never match a Host
+# header - entries here must be bare hostnames.
+ALLOWED_HOSTS = _split(config(
+    'ALLOWED_HOSTS',
+    default='localhost,127.0.0.1,procure-to-pay-backend-y65j.onrender.com',
+))
 
-# Application definition
-DJANGO_APPS = [
+# Application definition. Apps and middleware are tuples: Django never
+# mutates them after startup, and immutability rules out accidental
+# edits from other settings code.
+DJANGO_APPS = (
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-]
+)
 
-THIRD_PARTY_APPS = [
+# Swagger/redoc are a dev/staging tool; loading drf_yasg (and the
+# inspector machinery it drags in) on production workers is wasted boot
+# time, so it only registers when docs are wanted
+DOCS_ENABLED = config('DOCS_ENABLED', default=DEBUG, cast=bool)
+
+THIRD_PARTY_APPS = (
     'rest_framework',
     'rest_framework.authtoken',
     'rest_framework_simplejwt',
     'corsheaders',
-    'drf_yasg',
-]
+) + (('drf_yasg',) if DOCS_ENABLED else ())
 
-LOCAL_APPS = [
+LOCAL_APPS = (
     'apps.accounts',
     'apps.purchases',
     'apps.documents',
-]
+)
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
-MIDDLEWARE = [
+MIDDLEWARE = (
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -51,16 +74,47 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
+)
+
+# API-only mode: strips the admin and the session/messages/CSRF
+# machinery the JWT API never uses - SessionMiddleware alone costs a
+# session-store hit per request. Off by default because the Django
+# admin (and its checks) require all three.
+API_ONLY = config('API_ONLY', default=False, cast=bool)
+
+if API_ONLY:
+    _api_only_apps = ('django.contrib.admin', 'django.contrib.sessions',
+                      'django.contrib.messages')
+    INSTALLED_APPS = tuple(a for a in INSTALLED_APPS if a not in _api_only_apps)
+    # AuthenticationMiddleware must go with SessionMiddleware: it
+    # raises ImproperlyConfigured on every request without a session,
+    # and DRF's JWT authentication sets request.user itself
+    _api_only_middleware = ('django.contrib.sessions.middleware.SessionMiddleware',
+                            'django.middleware.csrf.CsrfViewMiddleware',
+                            'django.contrib.auth.middleware.AuthenticationMiddleware',
+                            'django.contrib.messages.middleware.MessageMiddleware')
+    MIDDLEWARE = tuple(m for m in MIDDLEWARE if m not in _api_only_middleware)
 
 ROOT_URLCONF = 'config.urls'
 
+# Explicit loaders instead of APP_DIRS: the cached loader compiles each
+# template once per process and stops the app-dirs finder from statting
+# every app's templates/ on render. Left uncached under DEBUG so edits
+# show up without a restart (matching Django's own default behaviour).
+_TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
-        'APP_DIRS': True,
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': False,
         'OPTIONS': {
+            'loaders': _TEMPLATE_LOADERS if DEBUG else [
+                ('django.template.loaders.cached.Loader', _TEMPLATE_LOADERS),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -71,12 +125,21 @@ TEMPLATES = [
     },
 ]
 
+if API_ONLY:
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+        'django.contrib.messages.context_processors.messages'
+    )
+
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database configuration with fallback
 DATABASE_URL = config('DATABASE_URL', default='sqlite:///db.sqlite3')
 
 if DATABASE_URL.startswith('postgresql'):
+    # Only needed to parse postgres URLs; keep it off the sqlite/dev
+    # import path
+    import dj_database_url
+
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
@@ -84,6 +147,16 @@ if DATABASE_URL.startswith('postgresql'):
             conn_health_checks=True,
         )
     }
+    # Render fronts postgres with PgBouncer in transaction mode, where
+    # server-side cursors silently break (the cursor dies with the
+    # transaction the pooler hands back). Keep requests non-atomic; the
+    # views that need transactions already open them explicitly.
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+    DATABASES['default']['ATOMIC_REQUESTS'] = False
+    DATABASES['default'].setdefault('OPTIONS', {}).update(
+        sslmode='require',
+        application_name='p2p',
+    )
 else:
     DATABASES = {
         'default': {
@@ -116,12 +189,21 @@ USE_TZ = True
 
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = config('STATIC_URL', default='/static/')
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+if DEBUG:
+    # Plain storage in development: no manifest to keep in sync and no
+    # compression pass on collectstatic
+    STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+else:
+    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+    # Hashed names are immutable - cache them for a year and drop the
+    # unhashed duplicates from STATIC_ROOT
+    WHITENOISE_MAX_AGE = 31536000
+    WHITENOISE_KEEP_ONLY_HASHED_FILES = True
 
 # Media files
 MEDIA_URL = config('MEDIA_URL', default='/media/')
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_ROOT = BASE_DIR / 'media'
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -138,7 +220,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'config.pagination.DefaultCursorPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
@@ -146,9 +228,14 @@ REST_FRAMEWORK = {
     ],
 }
 
-# JWT Configuration
-from datetime import timedelta
+if API_ONLY:
+    # No sessions means session auth can never succeed; removing it
+    # also skips its CSRF enforcement pass on every request
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'].remove(
+        'rest_framework.authentication.SessionAuthentication'
+    )
 
+# JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -157,15 +244,16 @@ SIMPLE_JWT = {
 }
 
 # CORS settings
-CORS_ALLOWED_ORIGINS = config(
-    'CORS_ALLOWED_ORIGINS', 
-    default='http://localhost:3000,http://127.0.0.1:3000', 
-    cast=Csv()
-)
+CORS_ALLOWED_ORIGINS = _split(config(
+    'CORS_ALLOWED_ORIGINS',
+    default='http://localhost:3000,http://127.0.0.1:3000',
+))
 
+# Compiled once at import; corsheaders passes these to re.match, which
+# accepts Pattern objects, so the per-request regex-cache lookup goes away
 CORS_ALLOWED_ORIGIN_REGEXES = [
-    r"^https://.*\.vercel\.app$",
-    r"^https://.*\.render\.com$",
+    re.compile(r"^https://.*\.vercel\.app$"),
+    re.compile(r"^https://.*\.render\.com$"),
 ]
 
 CORS_ALLOW_CREDENTIALS = True
@@ -181,7 +269,14 @@ if REDIS_URL:
             'LOCATION': REDIS_URL,
             'TIMEOUT': 7200,
             'OPTIONS': {
-                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                # Forwarded to redis-py's connection pool. The old
+                # CLIENT_CLASS entry was django-redis specific and is
+                # rejected by Django's built-in backend. redis-py picks
+                # up the C parser automatically once hiredis is
+                # installed, so no parser_class pin is needed.
+                'max_connections': config('REDIS_MAX_CONN', default=100, cast=int),
+                'socket_connect_timeout': 5,
+                'socket_timeout': 5,
             },
             'KEY_PREFIX': 'procure_pay',
             'VERSION': 1,
@@ -192,11 +287,13 @@ if REDIS_URL:
     CELERY_BROKER_URL = REDIS_URL
     CELERY_RESULT_BACKEND = REDIS_URL
 else:
-    # Fallback to local memory cache
+    # Fallback to a file-based cache: unlike locmem (a private dict per
+    # worker process with zero cross-worker hits), the filesystem is
+    # shared by all workers and needs no extra service or table
     CACHES = {
         'default': {
-            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-            'LOCATION': 'document-processing-cache',
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache',
             'TIMEOUT': 7200,
             'OPTIONS': {
                 'MAX_ENTRIES': 1000,
@@ -209,10 +306,14 @@ else:
     CELERY_TASK_EAGER_PROPAGATES = True
 
 # Session configuration
-SESSION_ENGINE = 'django.contrib.sessions.backends.cache' if REDIS_URL else 'django.contrib.sessions.backends.db'
+# cached_db without Redis: reads hit the (now shared) cache, writes
+# stay durable in the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cache' if REDIS_URL else 'django.contrib.sessions.backends.cached_db'
 SESSION_CACHE_ALIAS = 'default'
 SESSION_COOKIE_AGE = 86400  # 24 hours
-SESSION_SAVE_EVERY_REQUEST = True
+# Only write sessions when they actually change; True forced a session
+# write on every request, which the JWT API paths never need
+SESSION_SAVE_EVERY_REQUEST = False
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 
 # AI Processing settings
@@ -260,7 +361,15 @@ if not DEBUG:
     CSRF_COOKIE_SECURE = True
     X_FRAME_OPTIONS = 'DENY'
 
-# Logging configuration
+# Logging configuration: a single console handler on the root logger -
+# the previous per-app logger entries each re-attached the same handler.
+# The verbose formatter's process/thread ids cost a syscall per record,
+# so production records skip them and the collection is switched off.
+if not DEBUG:
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -270,7 +379,7 @@ LOGGING = {
             'style': '{',
         },
         'simple': {
-            'format': '{levelname} {message}',
+            'format': '{levelname} {asctime} {name} {message}',
             'style': '{',
         },
     },
@@ -278,30 +387,13 @@ LOGGING = {
         'console': {
             'level': 'INFO',
             'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
+            'formatter': 'verbose' if DEBUG else 'simple',
         },
     },
     'root': {
         'handlers': ['console'],
         'level': 'INFO',
     },
-    'loggers': {
-        'django': {
-            'handlers': ['console'],
-            'level': 'INFO',
-            'propagate': False,
-        },
-        'apps.documents': {
-            'handlers': ['console'],
-            'level': 'INFO',
-            'propagate': False,
-        },
-        'apps.purchases': {
-            'handlers': ['console'],
-            'level': 'INFO',
-            'propagate': False,
-        },
-    },
 }
 
 # Swagger/OpenAPI settings
@@ -316,8 +408,9 @@ SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': False,
 }
 
-# Additional settings for Render deployment
-if 'render.com' in config('ALLOWED_HOSTS', default=''):
+# Additional settings for Render deployment; check the already-parsed
+# host list rather than re-reading the env through a second config() call
+if any('render.com' in host for host in ALLOWED_HOSTS):
     # Production settings for Render
     STATICFILES_DIRS = []
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
\ No newline at end of file
@@ -5,38 +5,43 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-# Swagger/OpenAPI Schema
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Procure-to-Pay API",
-      default_version='v1',
-      description="REST API for Purchase Request and Approval System",
-      contact=openapi.Contact(email="contact@procuretopay.local"),
-      license=openapi.License(name="MIT License"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
 
 urlpatterns = [
-    # Admin
-    path('admin/', admin.site.urls),
-    
     # API URLs
     path('api/auth/', include('apps.accounts.urls')),
     path('api/', include('apps.purchases.urls')),
     path('api/documents/', include('apps.documents.urls')),
-    
-    # API Documentation
-    path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    path('api/swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
 ]
 
+# API documentation, only when drf_yasg is installed (DOCS_ENABLED)
+if settings.DOCS_ENABLED:
+    from rest_framework import permissions
+    from drf_yasg.views import get_schema_view
+    from drf_yasg import openapi
+
+    # Swagger/OpenAPI Schema
+    schema_view = get_schema_view(
+       openapi.Info(
+          title="Procure-to-Pay API",
+          default_version='v1',
+          description="REST API for Purchase Request and Approval System",
+          contact=openapi.Contact(email="contact@procuretopay.local"),
+          license=openapi.License(name="MIT License"),
+       ),
+       public=True,
+       permission_classes=(permissions.AllowAny,),
+    )
+
+    urlpatterns += [
+        path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+        path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+        path('api/swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    ]
+
+# Admin only exists outside API-only deployments
+if not settings.API_ONLY:
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,14 +1,20 @@
+import os
+
 from PIL import Image, ImageDraw
 import pytesseract
 
-# Explicitly tell pytesseract where tesseract.exe is
-pytesseract.pytesseract.tesseract_cmd = r"C:\ProgramData\chocolatey\bin\tesseract.exe"
+# Point pytesseract at the binary via env var; the default works where
+# tesseract is on PATH (the old hard-coded chocolatey path broke Linux)
+tesseract_cmd = os.environ.get('TESSERACT_CMD')
+if tesseract_cmd:
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
 # Create a sample image
 img = Image.new('RGB', (200, 60), color=(73, 109, 137))
 d = ImageDraw.Draw(img)
 d.text((10, 10), "Hello World", fill=(255, 255, 0))
 
-# OCR
-text = pytesseract.image_to_string(img)
+# OCR - single text line (psm 7), LSTM engine only (oem 1): skips
+# full-page layout analysis and legacy engine init for this one-liner
+text = pytesseract.image_to_string(img, lang='eng', config='--psm 7 --oem 1')
 print("Detected text:", text)